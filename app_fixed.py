@@ -1,30 +1,17 @@
 import streamlit as st
-import numpy as np
-import json
-from datetime import datetime
 import os
 import sys
+from collections import Counter
 
 # Add backend to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-from clip_service import CLIPService
-from qdrant_service_fixed import QdrantService
-from memory_service import MemoryService
 from config_fixed import CRISIS_PROTOCOLS, SYNTHETIC_CRISES
 
 # ============================================================
-# PAGE CONFIG
+# STATIC CONTENT (built once per process, not per rerun)
 # ============================================================
-st.set_page_config(
-    page_title="EchoGuard - Crisis Response System",
-    page_icon="🚨",
-    layout="wide",
-    initial_sidebar_state="expanded"
-)
-
-# Custom CSS
-st.markdown("""
+_CSS_BLOCK = """
 <style>
     .main { padding: 20px; }
     .crisis-card {
@@ -38,7 +25,75 @@ st.markdown("""
     .error { color: #ff6b6b; font-weight: bold; }
     .warning { color: #ffa502; font-weight: bold; }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+_HEADER_HTML = """
+<div style="text-align: center; padding: 20px;">
+    <h1>🚨 EchoGuard - Multimodal Crisis Response System</h1>
+    <p style="font-size: 18px; color: #666;">AI-powered disaster intelligence using image + text analysis</p>
+</div>
+"""
+
+_INFO_MD = """
+## 🚨 EchoGuard - System Information
+
+### What is EchoGuard?
+EchoGuard is an AI-powered multimodal crisis response system that:
+- Analyzes disaster images + text descriptions
+- Finds similar past incidents from database
+- Recommends emergency response protocols
+- Learns from new incidents for future responses
+
+### How It Works
+1. **Upload Crisis Image**: Provide visual evidence of the disaster
+2. **Describe Situation**: Add textual details about the crisis
+3. **AI Analysis**: CLIP model generates multimodal embeddings
+4. **Database Search**: Qdrant searches for similar historical incidents
+5. **Recommendations**: System suggests protocols based on similar cases
+6. **Learning**: New incidents saved for future reference
+
+### Database
+- **Total Incidents**: 25 real case studies
+- **Crisis Types**: Flood, Fire, Earthquake, Landslide, Cyclone
+- **Data Source**: Real news reports from India (2024-2025)
+- **Vector DB**: Qdrant with CLIP embeddings
+
+### Key Features
+- ✅ Multimodal Analysis (image + text)
+- ✅ Temporal Decay (recent incidents weighted higher)
+- ✅ Emergency Protocols (based on crisis type)
+- ✅ Continuous Learning (user incidents saved)
+- ✅ Similarity Matching (find relevant past cases)
+
+### Technologies Used
+- **CLIP**: Vision-Language Model for embeddings
+- **Qdrant**: Vector database for similarity search
+- **Streamlit**: Web interface
+- **OpenAI API**: For reasoning (optional enhancement)
+
+---
+**Version**: 2.0 FIXED | **Status**: ✅ Production Ready
+"""
+
+_FOOTER_HTML = "<p style='text-align: center; color: #666;'>EchoGuard © 2025 - AI Crisis Response System</p>"
+
+# ============================================================
+# PAGE CONFIG
+# ============================================================
+st.set_page_config(
+    page_title="EchoGuard - Crisis Response System",
+    page_icon="🚨",
+    layout="wide",
+    initial_sidebar_state="expanded"
+)
+
+# Custom CSS
+st.markdown(_CSS_BLOCK, unsafe_allow_html=True)
+
+# ============================================================
+# HEADER
+# ============================================================
+st.html(_HEADER_HTML)
 
 # ============================================================
 # INITIALIZE SERVICES
@@ -46,6 +101,11 @@ st.markdown("""
 @st.cache_resource
 def initialize_services():
     """Initialize all services ONCE"""
+    # Heavy imports (torch, CLIP, Qdrant client) only on the cache-miss path
+    from clip_service import CLIPService
+    from qdrant_service_fixed import QdrantService
+    from memory_service import MemoryService
+
     print("\n" + "="*70)
     print("🚀 INITIALIZING ECHOGUARD SYSTEM - FIXED VERSION")
     print("="*70 + "\n")
@@ -68,19 +128,13 @@ def initialize_services():
 
     # 4. Load synthetic crisis data with REAL EMBEDDINGS
     print("📍 Generating embeddings for 25 REAL crisis cases...")
-    vectors = []
-    
-    for idx, crisis in enumerate(SYNTHETIC_CRISES):
-        # Generate real text embedding from description and type
-        text_for_embedding = f"{crisis['type']}: {crisis['location']} - {crisis['description']}"
-        embedding = clip_service.generate_text_embedding(text_for_embedding)
-        vectors.append(embedding.tolist())
-        
-        if (idx + 1) % 5 == 0:
-            print(f"  ✅ Generated embeddings for {idx + 1}/{len(SYNTHETIC_CRISES)} crises")
+    # Generate real text embeddings from description and type in one batch
+    texts = [f"{c['type']}: {c['location']} - {c['description']}" for c in SYNTHETIC_CRISES]
+    embeddings = clip_service.generate_text_embeddings_batch(texts)
+    print(f"  ✅ Generated embeddings for {len(embeddings)}/{len(SYNTHETIC_CRISES)} crises")
 
     # Load into Qdrant
-    qdrant_svc.initialize_with_synthetic_data(vectors)
+    qdrant_svc.initialize_with_synthetic_data(embeddings)
 
     print("="*70)
     print("✅ SYSTEM INITIALIZATION COMPLETE - ALL SERVICES READY")
@@ -91,15 +145,23 @@ def initialize_services():
 # Initialize
 qdrant_service, clip_service, memory_service = initialize_services()
 
-# ============================================================
-# HEADER
-# ============================================================
-st.markdown("""
-<div style="text-align: center; padding: 20px;">
-    <h1>🚨 EchoGuard - Multimodal Crisis Response System</h1>
-    <p style="font-size: 18px; color: #666;">AI-powered disaster intelligence using image + text analysis</p>
-</div>
-""", unsafe_allow_html=True)
+
+@st.cache_data(show_spinner=False)
+def cached_image_embedding(image_bytes):
+    """
+    Image embedding keyed on upload content - re-analyzing the same image skips CLIP
+    Raises ValueError instead of returning the dummy vector, so failures aren't cached
+    """
+    embedding = clip_service.generate_image_embedding(image_bytes)
+    if embedding is clip_service._DUMMY:
+        raise ValueError("CLIP could not embed this image")
+    return embedding
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def load_all_crises():
+    """All crises from Qdrant, cached briefly so tab switches don't rescan the collection"""
+    return qdrant_service.get_all_crises()
 
 # ============================================================
 # MAIN INTERFACE
@@ -112,7 +174,9 @@ tab1, tab2, tab3, tab4 = st.tabs([
 ])
 
 # ============ TAB 1: ANALYZE CRISIS ============
-with tab1:
+@st.fragment
+def analyze_tab():
+    """Analyze tab - widget changes here rerun only this fragment"""
     st.markdown("### Upload Crisis Image & Description")
     
     col1, col2 = st.columns(2)
@@ -155,7 +219,11 @@ with tab1:
                 try:
                     # Step 1: Generate image embedding
                     st.info("📊 Step 1/4: Generating image embedding...")
-                    image_embedding = clip_service.generate_image_embedding(uploaded_image)
+                    try:
+                        image_embedding = cached_image_embedding(uploaded_image.getvalue())
+                    except ValueError:
+                        # Same fallback as before, but retried on the next analysis
+                        image_embedding = clip_service._DUMMY
 
                     # Step 2: Generate text embedding
                     st.info("📊 Step 2/4: Generating text embedding...")
@@ -237,7 +305,7 @@ with tab1:
                     # ============ SAVE TO MEMORY ============
                     if st.button("💾 Save This Incident to Memory", use_container_width=True):
                         incident_id = qdrant_service.save_user_incident(
-                            image_vector=hybrid_embedding.tolist(),
+                            image_vector=hybrid_embedding,
                             text_description=crisis_description,
                             metadata={
                                 "type": crisis_type,
@@ -247,6 +315,7 @@ with tab1:
                                 "affected_people": 0
                             }
                         )
+                        load_all_crises.clear()
                         st.success(f"✅ Incident saved as #{incident_id} for future learning!")
 
                 except Exception as e:
@@ -254,12 +323,17 @@ with tab1:
                     import traceback
                     st.error(traceback.format_exc())
 
+with tab1:
+    analyze_tab()
+
 # ============ TAB 2: VIEW DATABASE ============
-with tab2:
+@st.fragment
+def refresh_db_fragment():
+    """Database tab - the refresh button reruns only this fragment"""
     st.markdown("### 📊 Qdrant Database Contents")
 
     if st.button("🔄 Refresh Database", use_container_width=True):
-        all_crises = qdrant_service.get_all_crises()
+        all_crises = load_all_crises()
         st.success(f"✅ Found {len(all_crises)} total incidents in database")
 
         # Group by type
@@ -282,17 +356,15 @@ with tab2:
                     - Time: {metadata.get('timestamp', 'Unknown')}
                     """)
 
+with tab2:
+    refresh_db_fragment()
+
 # ============ TAB 3: PAST INCIDENTS ============
 with tab3:
     st.markdown("### 📚 Historical Incidents in Database")
 
-    crisis_types = {}
-    all_crises = qdrant_service.get_all_crises()
-    
-    for crisis in all_crises:
-        ctype = crisis.get("metadata", {}).get("type", "unknown")
-        if ctype not in crisis_types:
-            crisis_types[ctype] = len([c for c in all_crises if c.get("metadata", {}).get("type") == ctype])
+    all_crises = load_all_crises()
+    crisis_types = Counter(c.get("metadata", {}).get("type", "unknown") for c in all_crises)
 
     cols = st.columns(5)
     for i, (ctype, count) in enumerate(crisis_types.items()):
@@ -320,46 +392,7 @@ with tab3:
 
 # ============ TAB 4: INFO ============
 with tab4:
-    st.markdown("""
-    ## 🚨 EchoGuard - System Information
-
-    ### What is EchoGuard?
-    EchoGuard is an AI-powered multimodal crisis response system that:
-    - Analyzes disaster images + text descriptions
-    - Finds similar past incidents from database
-    - Recommends emergency response protocols
-    - Learns from new incidents for future responses
-
-    ### How It Works
-    1. **Upload Crisis Image**: Provide visual evidence of the disaster
-    2. **Describe Situation**: Add textual details about the crisis
-    3. **AI Analysis**: CLIP model generates multimodal embeddings
-    4. **Database Search**: Qdrant searches for similar historical incidents
-    5. **Recommendations**: System suggests protocols based on similar cases
-    6. **Learning**: New incidents saved for future reference
-
-    ### Database
-    - **Total Incidents**: 25 real case studies
-    - **Crisis Types**: Flood, Fire, Earthquake, Landslide, Cyclone
-    - **Data Source**: Real news reports from India (2024-2025)
-    - **Vector DB**: Qdrant with CLIP embeddings
-
-    ### Key Features
-    - ✅ Multimodal Analysis (image + text)
-    - ✅ Temporal Decay (recent incidents weighted higher)
-    - ✅ Emergency Protocols (based on crisis type)
-    - ✅ Continuous Learning (user incidents saved)
-    - ✅ Similarity Matching (find relevant past cases)
-
-    ### Technologies Used
-    - **CLIP**: Vision-Language Model for embeddings
-    - **Qdrant**: Vector database for similarity search
-    - **Streamlit**: Web interface
-    - **OpenAI API**: For reasoning (optional enhancement)
-
-    ---
-    **Version**: 2.0 FIXED | **Status**: ✅ Production Ready
-    """)
+    st.markdown(_INFO_MD)
 
 st.divider()
-st.markdown("<p style='text-align: center; color: #666;'>EchoGuard © 2025 - AI Crisis Response System</p>", unsafe_allow_html=True)
+st.html(_FOOTER_HTML)
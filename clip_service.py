@@ -3,14 +3,69 @@ import numpy as np
 import torch
 from PIL import Image
 import io
+import copy
+import os
+import math
+from functools import lru_cache
 try:
     from open_clip import create_model_and_transforms, tokenize
 except ImportError:
     from clip import load, tokenize
     create_model_and_transforms = None
+try:
+    from torchvision.transforms import v2 as T
+    from torchvision.io import decode_image, ImageReadMode
+except ImportError:
+    T = None
+try:
+    import onnxruntime as ort
+except ImportError:
+    ort = None
 
 from config import CLIP_MODEL_NAME, DEVICE, QDRANT_VECTOR_SIZE
 
+# CLIP image normalization constants
+CLIP_MEAN = (0.48145466, 0.4578275, 0.40821073)
+CLIP_STD = (0.26862954, 0.26130258, 0.27577711)
+
+# ONNX exports of the CLIP towers, used on CPU when onnxruntime is installed
+CLIP_ONNX_VISUAL = os.getenv("CLIP_ONNX_VISUAL", "clip_vis.onnx")
+CLIP_ONNX_TEXT = os.getenv("CLIP_ONNX_TEXT", "clip_txt.onnx")
+
+# Int8 dynamic quantization of Linear layers on CPU - opt-in (CLIP_INT8=1) until
+# its recall@1 on the synthetic crises has been checked against FP32
+CLIP_INT8 = os.getenv("CLIP_INT8", "0") == "1"
+
+
+@lru_cache(maxsize=1024)
+def _tokenize(text):
+    """Tokenize a single string once; returns a CPU tensor (move to DEVICE at call site)"""
+    return tokenize(text)
+
+
+class _ImageTower(torch.nn.Module):
+    """Wraps encode_image as forward() for ONNX export"""
+    
+    def __init__(self, model):
+        super().__init__()
+        self.model = model
+    
+    def forward(self, image):
+        # Call the class method so a torch.compile'd instance attribute is bypassed
+        return type(self.model).encode_image(self.model, image)
+
+
+class _TextTower(torch.nn.Module):
+    """Wraps encode_text as forward() for ONNX export"""
+    
+    def __init__(self, model):
+        super().__init__()
+        self.model = model
+    
+    def forward(self, tokens):
+        return type(self.model).encode_text(self.model, tokens)
+
+
 class CLIPService:
     """
     CLIP Model Service
@@ -20,6 +75,10 @@ class CLIPService:
     - Hybrid embeddings (image + text)
     """
     
+    # Shared read-only unit vector returned when the model is unavailable
+    _DUMMY = np.ones(QDRANT_VECTOR_SIZE, dtype=np.float32) / math.sqrt(QDRANT_VECTOR_SIZE)
+    _DUMMY.setflags(write=False)
+    
     def __init__(self):
         """Initialize CLIP model"""
         print("📥 Loading CLIP model with pretrained weights...")
@@ -47,10 +106,185 @@ class CLIPService:
         if self.model:
             self.model = self.model.to(DEVICE)
             self.model.eval()
+            if DEVICE == 'cuda':
+                # FP16 halves memory bandwidth on GPU; outputs are cast back to FP32
+                self.model = self.model.half()
+        
+        # ONNX Runtime sessions replace the torch encoders on CPU when available
+        self.ort_visual = None
+        self.ort_text = None
+        if self.model and DEVICE == 'cpu':
+            self._load_onnx_sessions()
+        
+        if self.model and DEVICE == 'cpu' and self.ort_visual is None and CLIP_INT8:
+            self._quantize_int8()
+        
+        if self.model and self.ort_visual is None:
+            self._compile_encoders()
+        
+        # Tensor-native preprocess that runs on DEVICE (PIL preprocess stays as fallback)
+        self.preprocess_v2 = None
+        if self.model and T is not None:
+            self.preprocess_v2 = T.Compose([
+                T.ToDtype(torch.float32, scale=True),
+                T.Resize(224, interpolation=T.InterpolationMode.BICUBIC, antialias=True),
+                T.CenterCrop(224),
+                T.Normalize(mean=CLIP_MEAN, std=CLIP_STD)
+            ])
         
         print(f"✓ CLIP model loaded with pretrained weights")
         print(f"✓ Using device: {DEVICE}")
     
+    def _load_onnx_sessions(self):
+        """Load graph-optimized ONNX Runtime sessions for both towers if exported"""
+        if ort is None:
+            return
+        if not (os.path.exists(CLIP_ONNX_VISUAL) and os.path.exists(CLIP_ONNX_TEXT)):
+            return
+        
+        try:
+            so = ort.SessionOptions()
+            so.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+            providers = ['CPUExecutionProvider']
+            self.ort_visual = ort.InferenceSession(CLIP_ONNX_VISUAL, sess_options=so, providers=providers)
+            self.ort_text = ort.InferenceSession(CLIP_ONNX_TEXT, sess_options=so, providers=providers)
+            self._check_onnx_sessions()
+            print("✓ Using ONNX Runtime CLIP encoders")
+        except Exception as e:
+            self.ort_visual = None
+            self.ort_text = None
+            print(f"⚠ ONNX Runtime unavailable, using PyTorch: {str(e)}")
+    
+    def _check_onnx_sessions(self):
+        """Run one dummy image and one dummy text through the ONNX towers and check the embedding size"""
+        dummy_image = np.zeros((1, 3, 224, 224), dtype=np.float32)
+        dummy_tokens = _tokenize("").numpy().astype(np.int64)
+        
+        image_features = self.ort_visual.run(None, {'input': dummy_image})[0]
+        text_features = self.ort_text.run(None, {'input': dummy_tokens})[0]
+        
+        assert image_features.shape[-1] == QDRANT_VECTOR_SIZE, \
+            f"ONNX image embedding size {image_features.shape[-1]} != {QDRANT_VECTOR_SIZE}"
+        assert text_features.shape[-1] == QDRANT_VECTOR_SIZE, \
+            f"ONNX text embedding size {text_features.shape[-1]} != {QDRANT_VECTOR_SIZE}"
+    
+    def _quantize_int8(self):
+        """Dynamically quantize Linear layers to int8 for the PyTorch CPU path"""
+        try:
+            from torch.ao.quantization import quantize_dynamic
+            self.model = quantize_dynamic(self.model, {torch.nn.Linear}, dtype=torch.qint8)
+            print("✓ CLIP Linear layers quantized to int8")
+        except Exception as e:
+            print(f"⚠ Int8 quantization unavailable, using FP32: {str(e)}")
+    
+    def export_onnx(self, visual_path=CLIP_ONNX_VISUAL, text_path=CLIP_ONNX_TEXT, quantize=False):
+        """
+        Export the image and text towers to ONNX (run once at build time)
+        
+        Args:
+            visual_path: Output path for the image tower
+            text_path: Output path for the text tower
+            quantize: Also convert both exports to int8 weights with onnxruntime
+        """
+        # Export from an FP32 CPU copy - the live model keeps its device and dtype.
+        # Compiled encode_* instance attributes are set aside while copying; the towers call the class methods
+        compiled = {name: self.model.__dict__.pop(name)
+                    for name in ('encode_image', 'encode_text') if name in self.model.__dict__}
+        try:
+            model = copy.deepcopy(self.model).float().cpu()
+        finally:
+            self.model.__dict__.update(compiled)
+        dummy_image = torch.zeros(1, 3, 224, 224)
+        dummy_tokens = _tokenize("")
+        
+        torch.onnx.export(
+            _ImageTower(model), dummy_image, visual_path,
+            input_names=['input'], output_names=['embedding'],
+            dynamic_axes={'input': {0: 'batch'}, 'embedding': {0: 'batch'}},
+            opset_version=17
+        )
+        torch.onnx.export(
+            _TextTower(model), dummy_tokens, text_path,
+            input_names=['input'], output_names=['embedding'],
+            dynamic_axes={'input': {0: 'batch'}, 'embedding': {0: 'batch'}},
+            opset_version=17
+        )
+        
+        if quantize:
+            from onnxruntime.quantization import quantize_dynamic, QuantType
+            for path in (visual_path, text_path):
+                fp32_path = path + ".fp32"
+                os.replace(path, fp32_path)
+                quantize_dynamic(fp32_path, path, weight_type=QuantType.QInt8)
+                os.remove(fp32_path)
+        
+        print(f"✓ Exported CLIP towers to {visual_path} and {text_path}")
+    
+    def _encode_image(self, image_input):
+        """Normalized image features as a float32 numpy array (N, 512)"""
+        if self.ort_visual is not None:
+            feats = self.ort_visual.run(None, {'input': image_input.float().cpu().numpy()})[0]
+            return feats / np.linalg.norm(feats, axis=-1, keepdims=True)
+        
+        with torch.inference_mode():
+            image_features = self.model.encode_image(image_input)
+            image_features = image_features / image_features.norm(dim=-1, keepdim=True)
+        return image_features.float().cpu().numpy()
+    
+    def _encode_text(self, text_input):
+        """Normalized text features as a float32 numpy array (N, 512)"""
+        if self.ort_text is not None:
+            feats = self.ort_text.run(None, {'input': text_input.cpu().numpy().astype(np.int64)})[0]
+            return feats / np.linalg.norm(feats, axis=-1, keepdims=True)
+        
+        with torch.inference_mode():
+            text_features = self.model.encode_text(text_input)
+            text_features = text_features / text_features.norm(dim=-1, keepdim=True)
+        return text_features.float().cpu().numpy()
+    
+    def _compile_encoders(self):
+        """
+        Compile the image and text towers with torch.compile (PyTorch 2.0+)
+        Warms up once so the first user request doesn't pay the compile cost
+        """
+        if not hasattr(torch, 'compile'):
+            self._warmup()
+            return
+        
+        try:
+            self.model.encode_image = torch.compile(
+                self.model.encode_image, mode='reduce-overhead', dynamic=False
+            )
+            self.model.encode_text = torch.compile(
+                self.model.encode_text, mode='reduce-overhead', dynamic=False
+            )
+            self._warmup()
+            print("✓ CLIP encoders compiled")
+        except Exception as e:
+            # Restore the eager class methods
+            self.model.__dict__.pop('encode_image', None)
+            self.model.__dict__.pop('encode_text', None)
+            print(f"⚠ torch.compile unavailable, using eager mode: {str(e)}")
+            self._warmup()
+    
+    def _warmup(self):
+        """
+        Run one dummy image and one dummy text through the model
+        Also checks the embedding size once so the encoders needn't resize per call
+        """
+        dtype = next(self.model.parameters()).dtype
+        dummy_image = torch.zeros(1, 3, 224, 224, device=DEVICE, dtype=dtype)
+        dummy_tokens = _tokenize("").to(DEVICE)
+        
+        with torch.inference_mode():
+            image_features = self.model.encode_image(dummy_image)
+            text_features = self.model.encode_text(dummy_tokens)
+        
+        assert image_features.shape[-1] == QDRANT_VECTOR_SIZE, \
+            f"CLIP image embedding size {image_features.shape[-1]} != {QDRANT_VECTOR_SIZE}"
+        assert text_features.shape[-1] == QDRANT_VECTOR_SIZE, \
+            f"CLIP text embedding size {text_features.shape[-1]} != {QDRANT_VECTOR_SIZE}"
+    
     def generate_image_embedding(self, image_bytes):
         """
         Generate embedding for an image
@@ -62,35 +296,42 @@ class CLIPService:
             numpy array of size 512
         """
         if not self.model:
-            return np.random.randn(QDRANT_VECTOR_SIZE).astype(np.float32)
+            return self._DUMMY
         
         try:
-            # Convert bytes to PIL Image if needed
-            if isinstance(image_bytes, bytes):
-                image = Image.open(io.BytesIO(image_bytes))
-            else:
-                image = image_bytes
-            
-            # Preprocess
-            image_input = self.preprocess(image).unsqueeze(0).to(DEVICE)
+            dtype = next(self.model.parameters()).dtype
+            image_input = None
             
-            # Get embedding
-            with torch.no_grad():
-                image_features = self.model.encode_image(image_input)
-                image_features = image_features / image_features.norm(dim=-1, keepdim=True)
+            # Fast path: decode and preprocess as a tensor on DEVICE
+            if isinstance(image_bytes, bytes) and self.preprocess_v2 is not None:
+                try:
+                    image_input = self._preprocess_tensor(image_bytes).to(dtype=dtype)
+                except Exception:
+                    # Formats decode_image can't read (e.g. BMP) go through PIL
+                    image_input = None
             
-            # Convert to numpy and normalize to 512 dims
-            embedding = image_features.cpu().numpy()[0].astype(np.float32)
+            if image_input is None:
+                # Convert bytes to PIL Image if needed
+                if isinstance(image_bytes, bytes):
+                    image = Image.open(io.BytesIO(image_bytes))
+                else:
+                    image = image_bytes
+                
+                # Preprocess
+                image_input = self.preprocess(image).unsqueeze(0).to(DEVICE, dtype=dtype)
             
-            if len(embedding) != QDRANT_VECTOR_SIZE:
-                # Resize if needed
-                embedding = np.pad(embedding, (0, max(0, QDRANT_VECTOR_SIZE - len(embedding))))[:QDRANT_VECTOR_SIZE]
-            
-            return embedding
+            # Get embedding (size checked once at load time)
+            return self._encode_image(image_input)[0].astype(np.float32)
         
         except Exception as e:
             print(f"⚠ Error processing image: {str(e)}")
-            return np.random.randn(QDRANT_VECTOR_SIZE).astype(np.float32)
+            return self._DUMMY
+    
+    def _preprocess_tensor(self, image_bytes):
+        """Decode image bytes to a uint8 tensor and run preprocess_v2 on DEVICE"""
+        raw = torch.frombuffer(bytearray(image_bytes), dtype=torch.uint8)
+        image = decode_image(raw, mode=ImageReadMode.RGB).to(DEVICE)
+        return self.preprocess_v2(image).unsqueeze(0)
     
     def generate_text_embedding(self, text):
         """
@@ -103,28 +344,42 @@ class CLIPService:
             numpy array of size 512
         """
         if not self.model:
-            return np.random.randn(QDRANT_VECTOR_SIZE).astype(np.float32)
+            return self._DUMMY
         
         try:
             # Tokenize
-            text_input = tokenize(text).to(DEVICE)
-            
-            # Get embedding
-            with torch.no_grad():
-                text_features = self.model.encode_text(text_input)
-                text_features = text_features / text_features.norm(dim=-1, keepdim=True)
-            
-            # Convert to numpy
-            embedding = text_features.cpu().numpy()[0].astype(np.float32)
-            
-            if len(embedding) != QDRANT_VECTOR_SIZE:
-                embedding = np.pad(embedding, (0, max(0, QDRANT_VECTOR_SIZE - len(embedding))))[:QDRANT_VECTOR_SIZE]
+            text_input = _tokenize(text).to(DEVICE)
             
-            return embedding
+            # Get embedding (size checked once at load time)
+            return self._encode_text(text_input)[0].astype(np.float32)
         
         except Exception as e:
             print(f"⚠ Error processing text: {str(e)}")
-            return np.random.randn(QDRANT_VECTOR_SIZE).astype(np.float32)
+            return self._DUMMY
+    
+    def generate_text_embeddings_batch(self, texts):
+        """
+        Generate embeddings for many texts in one forward pass
+        
+        Args:
+            texts: List of string descriptions
+        
+        Returns:
+            numpy array of shape (len(texts), 512)
+        """
+        if not self.model:
+            return np.broadcast_to(self._DUMMY, (len(texts), QDRANT_VECTOR_SIZE))
+        
+        try:
+            # Tokenize all texts together
+            tokens = torch.cat([_tokenize(t) for t in texts]).to(DEVICE)
+            
+            # Get embeddings
+            return self._encode_text(tokens).astype(np.float32)
+        
+        except Exception as e:
+            print(f"⚠ Error processing text batch: {str(e)}")
+            return np.broadcast_to(self._DUMMY, (len(texts), QDRANT_VECTOR_SIZE))
     
     def generate_hybrid_embedding(self, image_vector, text_vector, image_weight=0.6):
         """
@@ -138,17 +393,26 @@ class CLIPService:
         Returns:
             Hybrid embedding (512,)
         """
-        text_weight = 1.0 - image_weight
+        # Single-modality weights: inputs are already unit vectors
+        if image_weight == 1.0:
+            return np.asarray(image_vector, dtype=np.float32)
+        if image_weight == 0.0:
+            return np.asarray(text_vector, dtype=np.float32)
+        
+        iv = np.asarray(image_vector, dtype=np.float32)
+        tv = np.asarray(text_vector, dtype=np.float32)
         
-        hybrid = (np.array(image_vector) * image_weight + 
-                 np.array(text_vector) * text_weight)
+        # Weighted sum into a single buffer
+        hybrid = np.empty_like(iv)
+        np.multiply(iv, image_weight, out=hybrid)
+        hybrid += tv * (1.0 - image_weight)
         
         # Normalize
-        norm = np.linalg.norm(hybrid)
+        norm = math.sqrt(float(hybrid @ hybrid))
         if norm > 0:
-            hybrid = hybrid / norm
+            hybrid *= 1.0 / norm
         
-        return hybrid.astype(np.float32)
+        return hybrid
     
     def generate_dummy_vectors(self, count=5):
         """
@@ -1,10 +1,16 @@
 from datetime import datetime, timedelta
 import json
+import time
+import numpy as np
 from config import (
     CRISIS_PROTOCOLS, SEVERITY_LEVELS, 
     TOP_K_RESULTS, MIN_CONFIDENCE_THRESHOLD
 )
 
+# Time decay: full relevance for DECAY_HOURS, then linear down to MIN_DECAY at 3x DECAY_HOURS
+DECAY_HOURS = 24
+MIN_DECAY = 0.3
+
 class MemoryService:
     """
     Manages EchoGuard's temporal memory
@@ -17,8 +23,37 @@ class MemoryService:
     def __init__(self):
         """Initialize memory service"""
         self.memory_log = []
+        
+        # Columnar index of memory_log for ranking: parallel arrays, synced lazily
+        self._size = 0
+        self._ts = np.empty(16, dtype=np.float64)
+        self._sev = np.empty(16, dtype=np.float32)
+        self._sim = np.empty(16, dtype=np.float32)
+        self._incident = np.empty(16, dtype=bool)
+        self._decisions = set()  # memory_log positions of log_decision entries
         print("✓ Memory service initialized")
     
+    def _sync_columns(self):
+        """Index any records appended to memory_log since the last sync, growing by doubling"""
+        n = len(self.memory_log)
+        if n == self._size:
+            return
+        
+        if n > len(self._ts):
+            capacity = max(n, 2 * len(self._ts))
+            self._ts = np.resize(self._ts, capacity)
+            self._sev = np.resize(self._sev, capacity)
+            self._sim = np.resize(self._sim, capacity)
+            self._incident = np.resize(self._incident, capacity)
+        
+        for idx in range(self._size, n):
+            record = self.memory_log[idx]
+            # NaN: no usable timestamp, treated as "now" at ranking time
+            self._ts[idx] = self._incident_epoch(record, np.nan)
+            self._sim[idx], self._sev[idx] = self._score_fields(record)
+            self._incident[idx] = idx not in self._decisions
+        self._size = n
+    
     def generate_reasoning_explanation(self, query_crisis, matched_crises):
         """
         Generate human-readable explanation of the AI's recommendation
@@ -84,8 +119,10 @@ class MemoryService:
         Returns:
             Incident record dictionary
         """
+        now = datetime.now()
         incident = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now.isoformat(),
+            "_ts_epoch": now.timestamp(),
             "image_vector": image_vector,
             "text_description": text_input,
             "metadata": metadata,
@@ -124,43 +161,35 @@ class MemoryService:
         
         return protocol
     
-    def calculate_time_decay(self, incident_timestamp, decay_hours=24):
+    def calculate_time_decay(self, ts_epoch, now_epoch=None, decay_hours=DECAY_HOURS):
         """
         Calculate how much an old incident's relevance decays over time
         
         Args:
-            incident_timestamp: ISO format timestamp
+            ts_epoch: Incident time as epoch seconds (see "_ts_epoch" on records)
+            now_epoch: Reference time as epoch seconds - pass one value per ranking batch
             decay_hours: Hours after which relevance drops significantly
         
         Returns:
             Decay factor (0-1, where 1 = full relevance, 0 = no relevance)
         """
-        try:
-            incident_time = datetime.fromisoformat(incident_timestamp)
-            now = datetime.now()
-            time_diff = now - incident_time
-            hours_passed = time_diff.total_seconds() / 3600
-            
-            # Linear decay
-            if hours_passed <= decay_hours:
-                decay = 1.0  # Full relevance within decay period
-            else:
-                # Gradually decay after decay_hours
-                decay = max(0.3, 1.0 - (hours_passed / (decay_hours * 3)) * 0.7)
-            
-            return round(decay, 2)
-            
-        except Exception as e:
-            print(f"⚠ Error calculating time decay: {str(e)}")
+        if now_epoch is None:
+            now_epoch = time.time()
+        
+        hours_passed = (now_epoch - ts_epoch) / 3600.0
+        
+        # Full relevance within decay period, then linear decay
+        if hours_passed <= decay_hours:
             return 1.0
+        return round(max(MIN_DECAY, 1.0 - (hours_passed / (decay_hours * 3)) * (1.0 - MIN_DECAY)), 2)
     
-    def rank_incidents_by_relevance(self, incidents, current_time=None):
+    def rank_incidents_by_relevance(self, incidents=None, current_time=None):
         """
         Rank multiple incidents by combined relevance score
         Considers: similarity, recency, severity
         
         Args:
-            incidents: List of incident records
+            incidents: List of incident records (default: this service's memory log)
             current_time: Reference time (default: now)
         
         Returns:
@@ -169,47 +198,90 @@ class MemoryService:
         if current_time is None:
             current_time = datetime.now()
         
-        scored_incidents = []
+        now_epoch = current_time.timestamp()
         
-        for incident in incidents:
-            try:
-                similarity = incident.get("similarity_score", 0.5)
-                severity = SEVERITY_LEVELS.get(
-                    incident.get("severity", "medium"), 0.5
-                )
-                time_decay = self.calculate_time_decay(
-                    incident.get("timestamp")
-                )
-                
-                # Combined score: 50% similarity, 30% time, 20% severity
-                combined_score = (
-                    similarity * 0.5 +
-                    (time_decay * 100) * 0.3 +
-                    (severity * 100) * 0.2
-                )
-                
-                incident_copy = incident.copy()
-                incident_copy["relevance_score"] = round(combined_score, 2)
-                scored_incidents.append(incident_copy)
-                
-            except Exception as e:
-                print(f"⚠ Error scoring incident: {str(e)}")
+        if incidents is None:
+            # Score the logged incidents (not decisions) straight from the column arrays
+            self._sync_columns()
+            idx = np.flatnonzero(self._incident[:self._size])
+            if len(idx) == 0:
+                return []
+            ts_epoch = self._ts[idx]
+            return self._rank(
+                [self.memory_log[i] for i in idx],
+                self._sim[idx], self._sev[idx],
+                np.where(np.isnan(ts_epoch), now_epoch, ts_epoch),
+                now_epoch
+            )
         
-        # Sort by relevance
-        scored_incidents.sort(
-            key=lambda x: x["relevance_score"], 
-            reverse=True
+        n = len(incidents)
+        if n == 0:
+            return []
+        
+        scores = np.array([self._score_fields(i) for i in incidents], dtype=np.float32)
+        similarity, severity = scores[:, 0], scores[:, 1]
+        ts_epoch = np.fromiter(
+            (self._incident_epoch(i, now_epoch) for i in incidents),
+            dtype=np.float64, count=n
         )
         
+        return self._rank(incidents, similarity, severity, ts_epoch, now_epoch)
+    
+    @staticmethod
+    def _rank(incidents, similarity, severity, ts_epoch, now_epoch):
+        """Score column arrays and return copies of incidents sorted by relevance"""
+        # Time decay, vectorized calculate_time_decay (rounded to 2 places like it)
+        hours_passed = (now_epoch - ts_epoch) / 3600.0
+        time_decay = np.where(
+            hours_passed <= DECAY_HOURS, 1.0,
+            np.round(np.maximum(MIN_DECAY, 1.0 - (hours_passed / (DECAY_HOURS * 3)) * (1.0 - MIN_DECAY)), 2)
+        )
+        
+        # Combined score: 50% similarity, 30% time, 20% severity
+        combined_score = similarity * 0.5 + time_decay * 30 + severity * 20
+        
+        # Sort by relevance
+        order = np.argsort(-combined_score, kind="stable")
+        
+        scored_incidents = []
+        for idx in order:
+            incident_copy = incidents[idx].copy()
+            incident_copy["relevance_score"] = round(float(combined_score[idx]), 2)
+            scored_incidents.append(incident_copy)
+        
         return scored_incidents
     
+    @staticmethod
+    def _score_fields(incident):
+        """
+        (similarity, severity weight) of a record - its own fields first, then its
+        metadata (where create_incident_record keeps them), then the defaults
+        """
+        metadata = incident.get("metadata") or {}
+        similarity = incident.get("similarity_score", metadata.get("similarity_score", 0.5))
+        severity = incident.get("severity", metadata.get("severity", "medium"))
+        return similarity, SEVERITY_LEVELS.get(severity, 0.5)
+    
+    @staticmethod
+    def _incident_epoch(incident, default):
+        """Epoch seconds of an incident, parsing the ISO timestamp only if not precomputed"""
+        ts_epoch = incident.get("_ts_epoch")
+        if ts_epoch is not None:
+            return ts_epoch
+        
+        try:
+            return datetime.fromisoformat(incident.get("timestamp")).timestamp()
+        except Exception:
+            # Unknown age counts as fully relevant
+            return default
+    
     def get_memory_snapshot(self):
         """
         Get current memory state (for logging/debugging)
         """
         return {
             "total_incidents": len(self.memory_log),
-            "recent_incidents": self.memory_log[-5:] if self.memory_log else [],
+            "recent_incidents": self.memory_log[-5:],
             "timestamp": datetime.now().isoformat()
         }
     
@@ -222,13 +294,15 @@ class MemoryService:
             decision: The AI's recommendation
             confidence: Confidence level (0-100)
         """
+        now = datetime.now()
         log_entry = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now.isoformat(),
             "query": query,
             "decision": decision,
             "confidence": confidence
         }
         
+        self._decisions.add(len(self.memory_log))
         self.memory_log.append(log_entry)
         print(f"📝 Decision logged with {confidence}% confidence")
         
@@ -1,13 +1,154 @@
 import os
 import json
+import uuid
+import hashlib
+import threading
+import itertools
+import time
+import logging
+import numpy as np
+from cachetools import TTLCache
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
 from qdrant_client import QdrantClient
-from qdrant_client.models import Distance, VectorParams, PointStruct
+from qdrant_client.models import (
+    Distance, VectorParams, PointStruct, SearchRequest, SearchParams,
+    ScalarQuantization, ScalarQuantizationConfig, ScalarType, QuantizationSearchParams,
+    OptimizersConfigDiff, HnswConfigDiff
+)
 from datetime import datetime
 from config_fixed import (
     QDRANT_URL, QDRANT_API_KEY, QDRANT_COLLECTION_NAME,
     QDRANT_VECTOR_SIZE, SYNTHETIC_CRISES
 )
 
+log = logging.getLogger(__name__)
+
+# Synthetic crisis payload fields and their defaults ("id" and "timestamp" are set per crisis)
+_PAYLOAD_SCHEMA = (
+    ("type", "unknown"),
+    ("location", "unknown"),
+    ("description", ""),
+    ("severity", "medium"),
+    ("protocol", ""),
+    ("affected_people", 0),
+    ("casualties", 0),
+    ("damage_estimate", "Unknown"),
+    ("response_time", "Unknown"),
+)
+
+# Segments below this many KB of vectors are searched without an HNSW index
+INDEXING_THRESHOLD = 20000
+
+# Temporal decay per 0.1-hour bin over the first 72 hours: full relevance for 24h,
+# then linear down to 0.3 (older results use the last bin)
+_DECAY_LUT = np.clip(1.0 - (np.arange(0, 720) / 10.0 / 72.0) * 0.7, 0.3, 1.0)
+_DECAY_LUT[:240] = 1.0
+
+# Search the int8-quantized index, then rescore the top candidates with the original vectors
+SEARCH_PARAMS = SearchParams(
+    quantization=QuantizationSearchParams(rescore=True, oversampling=2.0)
+)
+
+# Sync clients shared by every QdrantService instance, dispatched round-robin
+QDRANT_POOL_SIZE = int(os.getenv("QDRANT_POOL_SIZE", "5"))
+_POOL = []
+_POOL_LOCK = threading.Lock()
+_POOL_COUNTER = itertools.count()
+_POOL_IN_MEMORY = False
+
+# User incident IDs shared by every QdrantService instance, seeded once in _seed_next_id
+_NEXT_ID = None
+
+# Search results shared by every QdrantService instance (they share the clients too),
+# keyed by (vector digest, top_k, min_score)
+_QUERY_CACHE = TTLCache(maxsize=1000, ttl=300)
+_QUERY_CACHE_LOCK = threading.Lock()
+_QUERY_CACHE_GEN = 0
+_QUERY_CACHE_HOLD_UNTIL = 0.0
+
+# Seconds to skip caching after a wait=False write, which may not be searchable yet
+WRITE_SETTLE_SECONDS = 1.0
+
+def _invalidate_query_cache(pending=False):
+    """
+    Drop all cached search results
+    pending: the write was not awaited, so don't re-cache until it has had time to apply
+    """
+    global _QUERY_CACHE_GEN, _QUERY_CACHE_HOLD_UNTIL
+    with _QUERY_CACHE_LOCK:
+        _QUERY_CACHE.clear()
+        _QUERY_CACHE_GEN += 1
+        if pending:
+            _QUERY_CACHE_HOLD_UNTIL = max(_QUERY_CACHE_HOLD_UNTIL, time.monotonic() + WRITE_SETTLE_SECONDS)
+
+def _fill_pool():
+    """Create the shared client pool once (falls back to a single in-memory client)"""
+    global _POOL_IN_MEMORY
+    with _POOL_LOCK:
+        if _POOL:
+            return
+        try:
+            # Try connecting to local Qdrant (gRPC on 6334 - vectors travel as protobuf, not JSON)
+            for _ in range(max(1, QDRANT_POOL_SIZE)):
+                _POOL.append(QdrantClient(
+                    url=QDRANT_URL,
+                    api_key=QDRANT_API_KEY if QDRANT_API_KEY else None,
+                    timeout=30,
+                    prefer_grpc=True,
+                    grpc_port=6334
+                ))
+            print(f"✅ Connected to Qdrant at {QDRANT_URL} ({len(_POOL)} pooled clients)")
+        except Exception as e:
+            print(f"⚠️ Qdrant connection warning: {str(e)}")
+            # Fallback to in-memory for local dev - one client, since each holds its own data
+            _POOL[:] = [QdrantClient(":memory:")]
+            _POOL_IN_MEMORY = True
+            print("✅ Using in-memory Qdrant for local development")
+
+def _seed_next_id(client):
+    """Start the shared incident ID counter past existing points and the synthetic range"""
+    global _NEXT_ID
+    with _POOL_LOCK:
+        if _NEXT_ID is not None:
+            return
+        try:
+            start = client.count(collection_name=QDRANT_COLLECTION_NAME, exact=True).count + 1
+        except Exception:
+            # Collection doesn't exist yet
+            start = 1
+        # Synthetic crises occupy IDs 1..N
+        _NEXT_ID = itertools.count(max(start, len(SYNTHETIC_CRISES) + 1))
+
+def _vector_key(query_vector):
+    """Fast 64-bit digest of a query vector's float32 bytes"""
+    data = np.asarray(query_vector, dtype=np.float32).tobytes()
+    if xxhash is not None:
+        return xxhash.xxh64(data).intdigest()
+    return hashlib.blake2b(data, digest_size=8).digest()
+
+def _coerce_id(crisis_id):
+    """
+    Stable Qdrant point ID: ints and UUID strings as-is (so returned point IDs
+    round-trip), numbers cast to int as before, anything else as a deterministic UUIDv5
+    """
+    if type(crisis_id) is int:
+        return crisis_id
+    if isinstance(crisis_id, (int, float, np.integer, np.floating)):
+        return int(crisis_id)
+    try:
+        return str(uuid.UUID(str(crisis_id)))
+    except ValueError:
+        return str(uuid.uuid5(uuid.NAMESPACE_OID, str(crisis_id)))
+
+def _prep_vec(vector):
+    """Unit-length float32 copy of a vector, as the float list PointStruct expects"""
+    # DOT distance relies on unit-length vectors
+    v = np.ascontiguousarray(vector, dtype=np.float32)
+    return (v / (np.linalg.norm(v) + 1e-12)).tolist()
+
 class QdrantService:
     """
     Fixed Qdrant Service - NOW WORKING PROPERLY
@@ -17,27 +158,29 @@ class QdrantService:
     - Apply temporal decay
     """
 
-    def __init__(self):
-        """Initialize Qdrant client"""
-        try:
-            # Try connecting to local Qdrant
-            self.client = QdrantClient(
-                url=QDRANT_URL,
-                api_key=QDRANT_API_KEY if QDRANT_API_KEY else None,
-                timeout=30
-            )
-            print("✅ Connected to Qdrant at", QDRANT_URL)
-        except Exception as e:
-            print(f"⚠️ Qdrant connection warning: {str(e)}")
-            # Fallback to in-memory for local dev
-            self.client = QdrantClient(":memory:")
-            print("✅ Using in-memory Qdrant for local development")
+    def __init__(self, invalidate_on_upsert=True):
+        """
+        Initialize Qdrant client
+        invalidate_on_upsert: clear the shared search cache whenever points are written
+        """
+        self.invalidate_on_upsert = invalidate_on_upsert
+
+        _fill_pool()
+
+        # Pick the search API once instead of probing on every query
+        self._search_method = "search_points" if hasattr(_POOL[0], "search_points") else "search"
+
+        _seed_next_id(self._get_client())
+
+    def _get_client(self):
+        """Next pooled client, round-robin"""
+        return _POOL[next(_POOL_COUNTER) % len(_POOL)]
 
     def create_collection(self):
         """Create Qdrant collection for crisis vectors"""
         try:
             # Check if collection exists
-            collections = self.client.get_collections()
+            collections = self._get_client().get_collections()
             collection_names = [col.name for col in collections.collections]
 
             if QDRANT_COLLECTION_NAME in collection_names:
@@ -45,12 +188,27 @@ class QdrantService:
                 return True
 
             # Create new collection
-            self.client.create_collection(
+            self._get_client().create_collection(
                 collection_name=QDRANT_COLLECTION_NAME,
                 vectors_config=VectorParams(
                     size=QDRANT_VECTOR_SIZE,
-                    distance=Distance.COSINE  # Use cosine similarity for embeddings
-                )
+                    distance=Distance.DOT,  # Vectors are unit-length, so dot product == cosine
+                    on_disk=True  # Originals only needed for rescoring
+                ),
+                # Int8 copies kept in RAM for HNSW traversal (4x smaller than float32)
+                quantization_config=ScalarQuantization(
+                    scalar=ScalarQuantizationConfig(
+                        type=ScalarType.INT8,
+                        quantile=0.99,
+                        always_ram=True
+                    )
+                ),
+                # Fewer, larger segments and a denser graph for higher QPS and recall
+                optimizers_config=OptimizersConfigDiff(
+                    default_segment_number=2,
+                    indexing_threshold=INDEXING_THRESHOLD
+                ),
+                hnsw_config=HnswConfigDiff(m=32, ef_construct=200)
             )
             print(f"✅ Created collection '{QDRANT_COLLECTION_NAME}'")
             return True
@@ -59,181 +217,246 @@ class QdrantService:
             print(f"❌ Error creating collection: {str(e)}")
             return False
 
-    def add_point(self, crisis_id, vector, payload):
+    def add_point(self, crisis_id, vector, payload, wait=False):
         """Add a single crisis vector to Qdrant"""
-        try:
-            # Ensure timestamp exists
-            if "timestamp" not in payload:
-                payload["timestamp"] = datetime.now().isoformat()
+        return self.add_points([(crisis_id, vector, payload)], wait=wait) == 1
 
-            # Create point with unique ID
-            point = PointStruct(
-                id=int(crisis_id) if isinstance(crisis_id, (int, float)) else hash(str(crisis_id)) % 1000000,
-                vector=vector,
-                payload=payload
-            )
+    def add_points(self, points, wait=False):
+        """
+        Add many crisis vectors to Qdrant in a single upsert
+        points: iterable of (crisis_id, vector, payload) tuples
+        wait: block until the write is applied (only needed to read it back immediately)
+        Returns the number of points added
+        """
+        try:
+            structs = self._build_points(points)
 
-            # Upsert to Qdrant
-            self.client.upsert(
+            # One upsert for the whole batch
+            self._get_client().upsert(
                 collection_name=QDRANT_COLLECTION_NAME,
-                points=[point]
+                points=structs,
+                wait=wait
             )
+            if self.invalidate_on_upsert:
+                _invalidate_query_cache(pending=not wait)
 
-            print(f"✅ Added crisis {crisis_id} to Qdrant database")
-            return True
+            log.debug("✅ Added %d crises to Qdrant database", len(structs))
+            return len(structs)
 
         except Exception as e:
-            print(f"❌ Error adding point: {str(e)}")
-            return False
+            log.error("❌ Error adding points: %s", e)
+            return 0
+
+    def _build_points(self, points):
+        """Normalize (crisis_id, vector, payload) tuples and build PointStructs"""
+        structs = []
+        for crisis_id, vector, payload in points:
+            # Ensure timestamp exists, with epoch seconds alongside so decay never re-parses it
+            if "timestamp" not in payload:
+                now = time.time()
+                payload["timestamp"] = datetime.fromtimestamp(now).isoformat()
+                payload["ts_epoch"] = now
+            elif "ts_epoch" not in payload:
+                payload["ts_epoch"] = self._timestamp_epoch(payload["timestamp"])
+
+            structs.append(PointStruct(
+                id=_coerce_id(crisis_id),
+                vector=_prep_vec(vector),
+                payload=payload
+            ))
+        return structs
 
     def search_similar(self, query_vector, top_k=3, min_score=0.0):
         """
         FIXED: Search for similar crisis vectors
-        Uses correct API: search_points for newer Qdrant versions
-        Falls back to search() for older versions
+        Uses the search API detected once at init (search_points or search)
         """
         try:
+            cache_key = (_vector_key(query_vector), top_k, round(min_score, 3))
+            with _QUERY_CACHE_LOCK:
+                cached = _QUERY_CACHE.get(cache_key)
+                cache_gen = _QUERY_CACHE_GEN
+            if cached is not None:
+                # Copies, since apply_temporal_decay rewrites scores in place
+                return [dict(r) for r in cached]
+
             # Ensure query_vector is proper format
             if isinstance(query_vector, list):
                 query_vector = query_vector
             else:
                 query_vector = query_vector.tolist() if hasattr(query_vector, 'tolist') else query_vector
 
-            print(f"🔍 Searching for similar crises (top_k={top_k}, min_score={min_score})")
+            log.debug("🔍 Searching for similar crises (top_k=%s, min_score=%s)", top_k, min_score)
 
-            try:
-                # TRY NEW API FIRST (Qdrant 1.0+)
-                search_result = self.client.search_points(
-                    collection_name=QDRANT_COLLECTION_NAME,
-                    query_vector=query_vector,
+            search_result = getattr(self._get_client(), self._search_method)(
+                collection_name=QDRANT_COLLECTION_NAME,
+                query_vector=query_vector,
+                limit=top_k,
+                score_threshold=min_score,
+                search_params=SEARCH_PARAMS
+            )
+
+            formatted_results = []
+            # search_points() wraps hits in .points, search() returns the list directly
+            for result in getattr(search_result, "points", search_result):
+                formatted_results.append({
+                    "crisis_id": result.id,
+                    "similarity_score": round(float(result.score) * 100, 2),
+                    "metadata": dict(result.payload) if result.payload else {}
+                })
+
+            log.debug("✅ Found %d similar crises", len(formatted_results))
+            self._cache_results(cache_key, formatted_results, cache_gen)
+            return formatted_results
+
+        except Exception as e:
+            log.error("❌ Error searching: %s", e)
+            return []
+
+    def search_similar_batch(self, query_vectors, top_k=3, min_score=0.0):
+        """
+        Search for several query vectors in a single request
+        (e.g. image, text and hybrid vectors when reranking multimodal queries)
+        Returns one list of results per query vector, formatted like search_similar
+        Queries only run in parallel server-side over gRPC (prefer_grpc=True)
+        """
+        try:
+            requests = [
+                SearchRequest(
+                    vector=v.tolist() if hasattr(v, 'tolist') else v,
                     limit=top_k,
-                    score_threshold=min_score
+                    score_threshold=min_score,
+                    with_payload=True,
+                    params=SEARCH_PARAMS
                 )
+                for v in query_vectors
+            ]
+
+            batch_results = self._get_client().search_batch(
+                collection_name=QDRANT_COLLECTION_NAME,
+                requests=requests
+            )
 
-                formatted_results = []
-                for result in search_result.points:
-                    formatted_results.append({
+            formatted_batches = []
+            for search_result in batch_results:
+                formatted_batches.append([
+                    {
                         "crisis_id": result.id,
                         "similarity_score": round(float(result.score) * 100, 2),
                         "metadata": dict(result.payload) if result.payload else {}
-                    })
-
-                print(f"✅ Found {len(formatted_results)} similar crises using search_points()")
-                return formatted_results
+                    }
+                    for result in search_result
+                ])
 
-            except (AttributeError, TypeError) as e1:
-                print(f"⚠️ search_points not available: {str(e1)}")
-
-                # FALLBACK TO OLD API (Qdrant 0.x)
-                try:
-                    search_result = self.client.search(
-                        collection_name=QDRANT_COLLECTION_NAME,
-                        query_vector=query_vector,
-                        limit=top_k,
-                        score_threshold=min_score
-                    )
+            log.debug("✅ Batch search completed for %d queries", len(formatted_batches))
+            return formatted_batches
 
-                    formatted_results = []
-                    for result in search_result:
-                        formatted_results.append({
-                            "crisis_id": result.id,
-                            "similarity_score": round(float(result.score) * 100, 2),
-                            "metadata": dict(result.payload) if result.payload else {}
-                        })
-
-                    print(f"✅ Found {len(formatted_results)} similar crises using search()")
-                    return formatted_results
+        except Exception as e:
+            log.error("❌ Error in batch search: %s", e)
+            return [[] for _ in query_vectors]
 
-                except Exception as e2:
-                    print(f"❌ search() also failed: {str(e2)}")
-                    return []
+    def _cache_results(self, cache_key, results, cache_gen):
+        """
+        Store a copy of formatted search results in the query cache
+        Skipped if a write landed since the search started or may still be applying
+        """
+        with _QUERY_CACHE_LOCK:
+            if cache_gen == _QUERY_CACHE_GEN and time.monotonic() >= _QUERY_CACHE_HOLD_UNTIL:
+                _QUERY_CACHE[cache_key] = [dict(r) for r in results]
 
-        except Exception as e:
-            print(f"❌ Error searching: {str(e)}")
-            return []
+    def clear_query_cache(self):
+        """Drop all cached search results"""
+        _invalidate_query_cache()
 
     def apply_temporal_decay(self, results):
         """Apply time-based decay to search results - RECENT incidents score higher"""
-        from datetime import datetime, timedelta
-
-        now = datetime.now()
-        decay_threshold = timedelta(hours=24)
-        decayed_results = []
-
-        for result in results:
-            metadata = result.get("metadata", {})
-            try:
-                # Parse timestamp
-                incident_time = datetime.fromisoformat(metadata.get("timestamp", datetime.now().isoformat()))
-                time_diff = now - incident_time
-                hours_old = time_diff.total_seconds() / 3600
-
-                # Calculate decay factor
-                if time_diff < decay_threshold:
-                    decay_factor = 1.0  # Full relevance within 24 hours
-                else:
-                    # Gradual decay after 24 hours
-                    decay_factor = max(0.3, 1.0 - (hours_old / 72) * 0.7)
-
-                # Update scores
-                result["original_score"] = result["similarity_score"]
-                result["similarity_score"] = round(result["similarity_score"] * decay_factor, 2)
-                result["time_decay_factor"] = round(decay_factor, 2)
-                result["hours_old"] = round(hours_old, 1)
-
-            except Exception as e:
-                print(f"⚠️ Could not parse timestamp: {str(e)}")
-                result["hours_old"] = 0
-                result["time_decay_factor"] = 1.0
+        if not results:
+            return []
 
-            decayed_results.append(result)
+        # Age from the stored epoch seconds - no parsing for points written with ts_epoch
+        now = time.time()
+        epochs = np.fromiter(
+            (self._result_epoch(result.get("metadata", {}), now) for result in results),
+            dtype=np.float64, count=len(results)
+        )
+        hours_old = (now - epochs) / 3600.0
+
+        # Full relevance within 24 hours, then gradual decay down to 0.3
+        decay = _DECAY_LUT[np.clip((hours_old * 10).astype(np.int64), 0, len(_DECAY_LUT) - 1)]
+
+        original = np.fromiter(
+            (result["similarity_score"] for result in results),
+            dtype=np.float64, count=len(results)
+        )
+        scores = np.round(original * decay, 2)
+
+        # Update scores
+        for idx, result in enumerate(results):
+            result["original_score"] = result["similarity_score"]
+            result["similarity_score"] = float(scores[idx])
+            result["time_decay_factor"] = round(float(decay[idx]), 2)
+            result["hours_old"] = round(float(hours_old[idx]), 1)
 
         # Sort by final score
-        decayed_results.sort(key=lambda x: x["similarity_score"], reverse=True)
-        return decayed_results
+        order = np.argsort(-scores, kind="stable")
+        return [results[idx] for idx in order]
+
+    @classmethod
+    def _result_epoch(cls, metadata, now):
+        """Epoch seconds of a result: stored ts_epoch, else its parsed timestamp, else now"""
+        ts_epoch = metadata.get("ts_epoch")
+        if ts_epoch is None:
+            # Points stored before ts_epoch existed
+            ts_epoch = cls._timestamp_epoch(metadata.get("timestamp"))
+        return now if ts_epoch is None else ts_epoch
+
+    @staticmethod
+    def _timestamp_epoch(timestamp):
+        """Epoch seconds of an ISO timestamp, None if unparseable"""
+        try:
+            return datetime.fromisoformat(timestamp).timestamp()
+        except (ValueError, TypeError):
+            return None
 
     def update_crisis_memory(self, crisis_id, new_data):
-        """Update an existing crisis with new information"""
+        """Update an existing crisis with new information (payload only - the vector stays put)"""
         try:
-            result = self.client.retrieve(
+            result = self._get_client().retrieve(
                 collection_name=QDRANT_COLLECTION_NAME,
-                ids=[crisis_id]
+                ids=[_coerce_id(crisis_id)],
+                with_payload=False,
+                with_vectors=False
             )
 
             if not result:
-                print(f"❌ Crisis {crisis_id} not found")
+                log.warning("❌ Crisis %s not found", crisis_id)
                 return False
 
-            # Update payload
-            current_data = dict(result[0].payload) if result[0].payload else {}
-            current_data.update(new_data)
-            current_data["last_updated"] = datetime.now().isoformat()
-
-            # Upsert with updated data
-            point = PointStruct(
-                id=crisis_id,
-                vector=result[0].vector,
-                payload=current_data
-            )
-
-            self.client.upsert(
+            # Merge new fields into the stored payload
+            self._get_client().set_payload(
                 collection_name=QDRANT_COLLECTION_NAME,
-                points=[point]
+                payload={**new_data, "last_updated": datetime.now().isoformat()},
+                points=[_coerce_id(crisis_id)],
+                wait=False
             )
+            if self.invalidate_on_upsert:
+                _invalidate_query_cache(pending=True)
 
-            print(f"✅ Updated crisis {crisis_id}")
+            log.debug("✅ Updated crisis %s", crisis_id)
             return True
 
         except Exception as e:
-            print(f"❌ Error updating crisis: {str(e)}")
+            log.error("❌ Error updating crisis: %s", e)
             return False
 
     def get_crisis_by_id(self, crisis_id):
         """Retrieve a specific crisis by ID"""
         try:
-            result = self.client.retrieve(
+            result = self._get_client().retrieve(
                 collection_name=QDRANT_COLLECTION_NAME,
-                ids=[crisis_id]
+                ids=[_coerce_id(crisis_id)],
+                with_payload=True,
+                with_vectors=False
             )
 
             if result:
@@ -245,70 +468,91 @@ class QdrantService:
             return None
 
         except Exception as e:
-            print(f"❌ Error retrieving crisis: {str(e)}")
+            log.error("❌ Error retrieving crisis: %s", e)
             return None
 
-    def get_all_crises(self):
-        """Get all crises from database"""
-        try:
-            points, _ = self.client.scroll(
+    def iter_crises(self, batch=256):
+        """
+        Stream all crises using scroll pagination
+        Yields {"id", "metadata"} dicts, fetching `batch` points per request
+        """
+        offset = None
+        while True:
+            points, offset = self._get_client().scroll(
                 collection_name=QDRANT_COLLECTION_NAME,
-                limit=1000
+                limit=batch,
+                offset=offset,
+                with_payload=True,
+                with_vectors=False
             )
 
-            crises = []
             for point in points:
-                crises.append({
+                yield {
                     "id": point.id,
                     "metadata": dict(point.payload) if point.payload else {}
-                })
+                }
+
+            if offset is None:
+                break
 
-            print(f"✅ Retrieved {len(crises)} crises from database")
+    def get_all_crises(self):
+        """Get all crises from database"""
+        try:
+            crises = list(self.iter_crises())
+
+            log.debug("✅ Retrieved %d crises from database", len(crises))
             return crises
 
         except Exception as e:
-            print(f"❌ Error getting all crises: {str(e)}")
+            log.error("❌ Error getting all crises: %s", e)
             return []
 
     def initialize_with_synthetic_data(self, vectors):
-        """Populate Qdrant with synthetic crisis data"""
+        """
+        Populate Qdrant with synthetic crisis data
+        vectors: (N, QDRANT_VECTOR_SIZE) array or list of vectors, one per crisis
+        """
         print("\n📍 Initializing Qdrant with 25 REAL crisis cases...")
 
         try:
-            added = 0
+            # Rows are L2-normalized once, per point, in _prep_vec
+            if vectors is None:
+                vectors = np.empty((0, QDRANT_VECTOR_SIZE), dtype=np.float32)
+            vectors = np.asarray(vectors, dtype=np.float32)
+
+            # Random 512-dim vectors for testing, generated in one call for any crises without one
+            rand_vecs = None
+            if len(vectors) < len(SYNTHETIC_CRISES):
+                rand_vecs = np.random.default_rng(0).standard_normal(
+                    (len(SYNTHETIC_CRISES), QDRANT_VECTOR_SIZE), dtype=np.float32
+                )
+
+            load_time = time.time()
+            points = []
             for idx, crisis in enumerate(SYNTHETIC_CRISES):
                 crisis_id = idx + 1  # Start from 1
 
                 # Get vector - if provided, use it; otherwise use random
-                if isinstance(vectors, list) and idx < len(vectors):
-                    vector = vectors[idx]
+                vector = vectors[idx] if idx < len(vectors) else rand_vecs[idx]
+
+                payload = {k: crisis.get(k, d) for k, d in _PAYLOAD_SCHEMA}
+                payload["id"] = crisis.get("id", f"crisis_{idx}")
+                if crisis.get("timestamp"):
+                    payload["timestamp"] = crisis["timestamp"]
+                    payload["ts_epoch"] = self._timestamp_epoch(crisis["timestamp"])
                 else:
-                    # Generate random 512-dim vector for testing
-                    import numpy as np
-                    vector = np.random.randn(QDRANT_VECTOR_SIZE).astype(np.float32).tolist()
-
-                try:
-                    self.add_point(
-                        crisis_id=crisis_id,
-                        vector=vector,
-                        payload={
-                            "id": crisis.get("id", f"crisis_{idx}"),
-                            "type": crisis.get("type", "unknown"),
-                            "location": crisis.get("location", "unknown"),
-                            "description": crisis.get("description", ""),
-                            "timestamp": crisis.get("timestamp", datetime.now().isoformat()),
-                            "severity": crisis.get("severity", "medium"),
-                            "protocol": crisis.get("protocol", ""),
-                            "affected_people": crisis.get("affected_people", 0),
-                            "casualties": crisis.get("casualties", 0),
-                            "damage_estimate": crisis.get("damage_estimate", "Unknown"),
-                            "response_time": crisis.get("response_time", "Unknown")
-                        }
-                    )
-                    added += 1
+                    payload["timestamp"] = datetime.fromtimestamp(load_time).isoformat()
+                    payload["ts_epoch"] = load_time
+
+                points.append((crisis_id, vector, payload))
 
-                except Exception as e:
-                    print(f"⚠️ Could not add crisis {crisis_id}: {str(e)}")
+            # Single upsert for all crises, with indexing paused during the bulk load
+            self._set_indexing_threshold(0)
+            try:
+                # wait=True: the Past Incidents tab scrolls these points on first render
+                added = self.add_points(points, wait=True)
+            finally:
+                self._set_indexing_threshold(INDEXING_THRESHOLD)
 
             print(f"\n✅ Successfully loaded {added}/{len(SYNTHETIC_CRISES)} synthetic crises into Qdrant")
             return added
@@ -317,17 +561,33 @@ class QdrantService:
             print(f"❌ Error initializing synthetic data: {str(e)}")
             return 0
 
+    def _set_indexing_threshold(self, threshold):
+        """Pause (0) or resume HNSW indexing on the collection"""
+        try:
+            self._get_client().update_collection(
+                collection_name=QDRANT_COLLECTION_NAME,
+                optimizer_config=OptimizersConfigDiff(indexing_threshold=threshold)
+            )
+        except Exception as e:
+            print(f"⚠️ Could not set indexing threshold: {str(e)}")
+
     def save_user_incident(self, image_vector, text_description, metadata):
-        """Save uploaded user incident to database for continuous learning"""
+        """
+        Save uploaded user incident to database for continuous learning
+        image_vector: np.ndarray embedding - normalized and converted to a float list in add_points
+        """
         try:
-            # Get next ID
-            all_crises = self.get_all_crises()
-            next_id = len(all_crises) + 1
+            # Get next ID (atomic - one service instance serves every session thread)
+            next_id = next(_NEXT_ID)
 
             # Create incident record
+            now = time.time()
+            now_iso = datetime.fromtimestamp(now).isoformat()
             incident_payload = {
                 "user_uploaded": True,
-                "upload_time": datetime.now().isoformat(),
+                "upload_time": now_iso,
+                "timestamp": now_iso,
+                "ts_epoch": now,
                 "description": text_description,
                 "type": metadata.get("type", "unknown"),
                 "location": metadata.get("location", "unknown"),
@@ -344,9 +604,9 @@ class QdrantService:
                 payload=incident_payload
             )
 
-            print(f"✅ Saved user incident as crisis {next_id} for future learning")
+            log.info("✅ Saved user incident as crisis %s for future learning", next_id)
             return next_id
 
         except Exception as e:
-            print(f"❌ Error saving user incident: {str(e)}")
+            log.error("❌ Error saving user incident: %s", e)
             return None